@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""大型報告的平行序列化基準測試
+
+以不同的 --jobs 產生同一份大型報告，列出耗時（中位數）與相對單一行程的加速比，
+並以 SHA-256 確認每種 jobs 的輸出與單一行程逐位元組相同（不同時結束代碼為 1）。
+
+用法：python3 benchmarks/bench_parallel.py [-n 3] [--requests 20000] [--jobs 1 2 4 8 16 32]
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from sample_run import write_run  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from report_generator import generate_html_report  # noqa: E402
+
+
+def bench(run_file, out_dir, jobs, n):
+    samples = []
+    for _ in range(n):
+        started = time.perf_counter()
+        result = generate_html_report(run_file, output_dir=out_dir, verbose=False, jobs=jobs)
+        samples.append(time.perf_counter() - started)
+    with open(result['output'], 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return statistics.median(samples), digest
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    default_jobs = [1] + [j for j in (2, 4, 8, 16, 32) if j <= cpus]
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', type=int, default=3, help='reports per jobs setting (default: 3)')
+    parser.add_argument('--requests', type=int, default=20000, help='requests in the synthetic run (default: 20000)')
+    parser.add_argument('--iterations', type=int, default=5, help='iterations per request (default: 5)')
+    parser.add_argument('--jobs', type=int, nargs='+', default=default_jobs,
+                        help=f'worker counts to compare (default: {" ".join(map(str, default_jobs))})')
+    args = parser.parse_args()
+    if 1 not in args.jobs:
+        args.jobs.insert(0, 1)
+
+    work = tempfile.mkdtemp(prefix='bench-parallel-')
+    try:
+        run_file = write_run(os.path.join(work, 'run.json'), args.requests, args.iterations)
+        size = os.path.getsize(run_file)
+        rows = []
+        for jobs in args.jobs:
+            out_dir = os.path.join(work, f'jobs-{jobs}')
+            os.mkdir(out_dir)
+            rows.append((jobs,) + bench(run_file, out_dir, jobs, args.n))
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    print(f'{args.requests} requests x {args.iterations} iterations ({size / 1e6:.1f} MB input), '
+          f'{args.n} reports per setting, {cpus} CPUs')
+    print(f'{"jobs":<6}{"s/report":>10}{"speedup":>10}  output')
+    serial = next(row for row in rows if row[0] == 1)
+    mismatched = False
+    for jobs, seconds, digest in rows:
+        same = digest == serial[2]
+        mismatched |= not same
+        print(f'{jobs:<6}{seconds:>10.2f}{serial[1] / seconds:>9.2f}x  '
+              f'{"identical" if same else "DIFFERS"} (sha256 {digest[:12]})')
+    return 1 if mismatched else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""小型報告的啟動成本基準測試
+
+比較三種方式產生同一份小型報告的耗時（中位數）：
+  cold  - 每份報告各啟動一次 generate_report.py
+  warm  - 單一 --serve 常駐行程，逐行送出指令
+  base  - （選填）以 --baseline 指定的舊版腳本逐次啟動，用於對照改動前後
+
+用法：python3 benchmarks/bench_startup.py [-n 50] [--requests 20] [--baseline old/generate_report.py]
+"""
+
+import argparse
+import json
+import os
+import py_compile
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from sample_run import write_run  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, 'generate_report.py')
+
+
+def bench_cold(script, args, n, cwd):
+    samples = []
+    for _ in range(n):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, script] + args, cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def bench_warm(command, n):
+    proc = subprocess.Popen([sys.executable, SCRIPT, '--serve'], stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, text=True, encoding='utf-8')
+    try:
+        # 第一筆指令讓行程完成啟動，不列入計時
+        line = json.dumps(command) + '\n'
+        proc.stdin.write(line)
+        proc.stdin.flush()
+        json.loads(proc.stdout.readline())
+        samples = []
+        for _ in range(n):
+            started = time.perf_counter()
+            proc.stdin.write(line)
+            proc.stdin.flush()
+            reply = json.loads(proc.stdout.readline())
+            samples.append(time.perf_counter() - started)
+            if not reply['ok']:
+                raise RuntimeError(reply['error'])
+        return statistics.median(samples)
+    finally:
+        proc.stdin.close()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', type=int, default=50, help='reports per mode (default: 50)')
+    parser.add_argument('--requests', type=int, default=20, help='requests in the synthetic run (default: 20)')
+    parser.add_argument('--iterations', type=int, default=2, help='iterations per request (default: 2)')
+    parser.add_argument('--baseline', help='an older generate_report.py to compare cold starts against')
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix='bench-startup-')
+    try:
+        run_file = write_run(os.path.join(work, 'run.json'), args.requests, args.iterations)
+        out_dir = os.path.join(work, 'out')
+        os.mkdir(out_dir)
+        # 確保位元組碼快取已建立（設定 PYTHONDONTWRITEBYTECODE 時執行不會自動寫入）
+        py_compile.compile(os.path.join(ROOT, 'report_generator.py'), doraise=True)
+        bench_cold(SCRIPT, [run_file, '--output-dir', out_dir], 1, work)
+
+        rows = [('cold', bench_cold(SCRIPT, [run_file, '--output-dir', out_dir], args.n, work)),
+                ('warm', bench_warm({'json_file': run_file, 'output_dir': out_dir}, args.n))]
+        if args.baseline:
+            # 舊版腳本固定輸出到自身資料夾的上一層，複製到暫存目錄中執行
+            legacy_dir = os.path.join(work, 'legacy', 'script')
+            os.makedirs(legacy_dir)
+            legacy = os.path.join(legacy_dir, os.path.basename(args.baseline))
+            shutil.copy(args.baseline, legacy)
+            rows.append(('base', bench_cold(legacy, [run_file], args.n, work)))
+        interpreter = bench_cold('-c', ['pass'], args.n, work)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    print(f'{args.n} reports, {args.requests} requests x {args.iterations} iterations')
+    print(f'{"mode":<6}{"ms/report":>12}{"vs cold":>10}')
+    cold = rows[0][1]
+    for mode, seconds in rows:
+        print(f'{mode:<6}{seconds * 1000:>12.1f}{cold / seconds:>9.2f}x')
+    print(f'(bare interpreter start: {interpreter * 1000:.1f} ms)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""產生基準測試用的合成 Postman 測試結果 JSON"""
+
+import json
+import random
+
+
+def make_run(requests=20, iterations=2, seed=1):
+    """回傳與 Postman 匯出格式相同結構的測試結果（固定亂數種子，可重現）"""
+    rng = random.Random(seed)
+    methods = ['GET', 'POST', 'PATCH', 'DELETE']
+    collection = []
+    results = []
+    total_pass = total_fail = 0
+    for i in range(requests):
+        rid = f'req-{i}'
+        collection.append({'id': rid, 'name': f'Request {i}', 'method': methods[i % len(methods)]})
+        code = rng.choice([200, 200, 200, 201, 404, 500])
+        names = [f'Status code is {code}', 'Response has body ✅', f'Schema check {i % 7}']
+        times = [rng.randint(20, 1500) for _ in range(iterations)]
+        all_tests = [{name: rng.random() > 0.05 for name in names} for _ in range(iterations)]
+        passed = sum(v for execution in all_tests for v in execution.values())
+        total_pass += passed
+        total_fail += len(names) * iterations - passed
+        results.append({
+            'id': rid,
+            'name': f'Request {i}',
+            'url': f'api.example.com/v1/items/{i}',
+            'time': sum(times) // iterations,
+            'responseCode': {'code': code, 'name': 'OK' if code < 400 else 'Error'},
+            'tests': all_tests[-1],
+            'testPassFailCounts': {name: {'pass': sum(e[name] for e in all_tests),
+                                          'fail': sum(not e[name] for e in all_tests)} for name in names},
+            'times': times,
+            'allTests': all_tests,
+        })
+    return {
+        'id': 'benchmark-run',
+        'name': 'Benchmark Run',
+        'timestamp': '2025-01-01T00:05:00.000Z',
+        'startedAt': '2025-01-01T00:00:00.000Z',
+        'totalPass': total_pass,
+        'totalFail': total_fail,
+        'collection': {'requests': collection},
+        'results': results,
+    }
+
+
+def write_run(path, requests=20, iterations=2, seed=1):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(make_run(requests, iterations, seed), f, ensure_ascii=False, indent=2)
+    return path
@@ -0,0 +1,2300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 匯入保持精簡以縮短每次啟動的時間：只在特定情況使用的模組（datetime、fnmatch、tempfile、
+# shutil、concurrent.futures 等）於需要時才匯入，常見的命令列參數也不經 argparse 解析；
+# re 與 collections 已由 json 間接載入。
+import json
+import os
+import re
+import sys
+import math
+import bisect
+from collections import Counter
+
+# 效能預算可設定的上限欄位 → (統計指標, 顯示名稱)
+BUDGET_LIMITS = {
+    'maxP95': ('p95', 'P95'),
+    'maxP99': ('p99', 'P99'),
+    'maxAvg': ('avg', '平均'),
+    'maxErrorRate': ('errorRate', '錯誤率'),
+}
+_GLOB_CHARS = re.compile(r'[*?\[]')
+
+
+def _percentile(counts, p):
+    """線性內插百分位數，內插結果取到小數第二位（與前端原本的計算方式相同）
+
+    輸入為 {耗時: 次數} 的計數表，計數表可直接相加合併，結果與排序後的完整清單相同。
+    """
+    n = sum(counts.values())
+    if not n:
+        return 0
+    idx = (p / 100) * (n - 1)
+    lo, hi = math.floor(idx), math.ceil(idx)
+    values = {}
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        for k in (lo, hi):
+            if k not in values and k < seen:
+                values[k] = value
+        if hi in values:
+            break
+    if lo == hi:
+        return values[lo]
+    return round(values[lo] + (values[hi] - values[lo]) * (idx - lo), 2)
+
+
+def _executions(result):
+    """每次執行的斷言結果：以 allTests 為準，無 allTests 時以 tests 視為單次執行"""
+    return result.get('allTests') or ([result['tests']] if result.get('tests') else [])
+
+
+def _times(result):
+    return result.get('times') or ([result['time']] if result.get('time') else [])
+
+
+# 結果中會被直接取用的欄位 → 允許的型別（缺少或為 null 皆可）
+_RESULT_FIELDS = {
+    'name': (str,),
+    'url': (str,),
+    'time': (int, float),
+    'responseCode': (dict,),
+    'tests': (dict,),
+    'allTests': (list,),
+    'times': (list,),
+}
+_FIELD_TYPE_NAMES = {str: '字串', int: '數值', float: '數值', dict: '物件', list: '陣列'}
+
+
+def _check_result(idx, r):
+    """檢查單筆結果的欄位型別，不符時拋出 ValueError（而非在統計途中失敗）"""
+    for key, types in _RESULT_FIELDS.items():
+        value = r.get(key)
+        if value is not None and (not isinstance(value, types) or isinstance(value, bool)):
+            raise ValueError(f'results 第 {idx} 筆的 {key} 需為{_FIELD_TYPE_NAMES[types[0]]}，'
+                             f'實際為 {type(value).__name__}')
+
+
+def _check_run(test_data):
+    """檢查測試結果頂層結構：需為物件，results 為陣列，name / startedAt 為字串"""
+    if not isinstance(test_data, dict):
+        raise ValueError(f'測試結果 JSON 頂層需為物件，實際為 {type(test_data).__name__}')
+    if test_data.get('results') is not None and not isinstance(test_data['results'], list):
+        raise ValueError('測試結果的 results 需為陣列')
+    for key in ('name', 'startedAt'):
+        if test_data.get(key) is not None and not isinstance(test_data[key], str):
+            raise ValueError(f'測試結果的 {key} 需為字串')
+
+
+class RequestStats:
+    """單一請求的可合併統計：耗時計數表、總和與（失敗）執行次數
+
+    可分批加入新的執行結果，增量更新時由狀態檔還原後繼續累計。
+    """
+
+    __slots__ = ('times', 'total', 'executions', 'failed')
+
+    def __init__(self, times=None, total=0, executions=0, failed=0):
+        self.times = Counter(dict(times or ()))
+        self.total = total
+        self.executions = executions
+        self.failed = failed
+
+    def add(self, times, executions):
+        for t in times:
+            if isinstance(t, (int, float)):
+                self.times[t] += 1
+                self.total += t
+        self.executions += len(executions)
+        self.failed += sum(1 for e in executions if isinstance(e, dict) and False in e.values())
+
+    def stats(self, code):
+        """錯誤率以「執行次數」為分母：回應碼 >= 400 時每次執行皆視為錯誤，
+        否則以含失敗斷言的執行次數計算。"""
+        count = sum(self.times.values())
+        runs = max(count, self.executions, 1)
+        errors = runs if (code or 0) >= 400 else self.failed
+        return {
+            'count': count,
+            'avg': round(self.total / count, 2) if count else 0,
+            'p95': _percentile(self.times, 95),
+            'p99': _percentile(self.times, 99),
+            'errorRate': round(errors / runs, 4),
+        }
+
+    def to_state(self):
+        return [list(self.times.items()), self.total, self.executions, self.failed]
+
+
+def compute_request_stats(result):
+    """計算單一請求（results 中的一筆）的耗時與錯誤率統計"""
+    stats = RequestStats()
+    stats.add(_times(result), _executions(result))
+    return stats.stats((result.get('responseCode') or {}).get('code'))
+
+
+def _compile_pattern(pattern):
+    """將 glob 樣式轉為比對函式；不含萬用字元者以字串相等比對"""
+    import fnmatch
+
+    if _GLOB_CHARS.search(pattern):
+        return re.compile(fnmatch.translate(pattern)).match
+    return pattern.__eq__
+
+
+class BudgetRules:
+    """預先編譯的效能預算規則集
+
+    每條規則以 name 或 url 的 glob 樣式比對請求（兩者皆設定時須同時符合）。
+    不含萬用字元的樣式放入字典做 O(1) 查詢；含萬用字元者另外合併成單一正則
+    作為前置篩選，未命中任何規則的請求只需一次比對即可略過。
+    """
+
+    def __init__(self, rules):
+        import fnmatch
+
+        self._source = rules
+        self.rules = []
+        self._literal = {'name': {}, 'url': {}}
+        self._glob = {'name': [], 'url': []}
+        for i, rule in enumerate(rules):
+            if not isinstance(rule, dict):
+                raise ValueError(f'第 {i + 1} 條預算規則格式錯誤')
+            limits = {k: rule[k] for k in BUDGET_LIMITS if rule.get(k) is not None}
+            if not limits:
+                raise ValueError(f'第 {i + 1} 條預算規則未設定任何上限（{", ".join(BUDGET_LIMITS)}）')
+            for k, v in limits.items():
+                if not isinstance(v, (int, float)) or isinstance(v, bool):
+                    raise ValueError(f'第 {i + 1} 條預算規則的 {k} 必須為數字')
+            patterns = {f: rule[f] for f in ('name', 'url') if rule.get(f)}
+            if not patterns:
+                raise ValueError(f'第 {i + 1} 條預算規則需指定 name 或 url 樣式')
+            entry = {
+                'label': rule.get('label') or ' & '.join(f'{f}={p}' for f, p in patterns.items()),
+                'limits': limits,
+                'match': {f: _compile_pattern(p) for f, p in patterns.items()},
+            }
+            self.rules.append(entry)
+            # 以第一個指定的欄位做索引，其餘欄位在候選規則上再驗證
+            key_field = 'name' if 'name' in patterns else 'url'
+            pattern = patterns[key_field]
+            if _GLOB_CHARS.search(pattern):
+                self._glob[key_field].append((len(self.rules) - 1, fnmatch.translate(pattern)))
+            else:
+                self._literal[key_field].setdefault(pattern, []).append(len(self.rules) - 1)
+        self._glob_any = {
+            f: re.compile('|'.join(f'(?:{rx})' for _, rx in globs)).match if globs else None
+            for f, globs in self._glob.items()
+        }
+
+    def __len__(self):
+        return len(self.rules)
+
+    @property
+    def fingerprint(self):
+        """規則內容的雜湊值，用於判斷增量更新的狀態檔是否仍適用"""
+        import hashlib
+
+        source = json.dumps(self._source, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+    def match(self, name, url):
+        """回傳符合此請求的規則（依設定檔順序）"""
+        values = {'name': name or '', 'url': url or ''}
+        candidates = []
+        for field, value in values.items():
+            candidates.extend(self._literal[field].get(value, ()))
+            any_match = self._glob_any[field]
+            if any_match and any_match(value):
+                candidates.extend(i for i, _ in self._glob[field]
+                                  if self.rules[i]['match'][field](value))
+        matched = []
+        for i in sorted(candidates):
+            rule = self.rules[i]
+            if all(m(values[f]) for f, m in rule['match'].items()):
+                matched.append(rule)
+        return matched
+
+    def evaluate(self, stats, name, url):
+        """比對單一請求的統計值，回傳違規清單"""
+        violations = []
+        for rule in self.match(name, url):
+            for limit_key, limit in rule['limits'].items():
+                metric = BUDGET_LIMITS[limit_key][0]
+                if stats[metric] > limit:
+                    violations.append({
+                        'rule': rule['label'],
+                        'metric': metric,
+                        'actual': stats[metric],
+                        'limit': limit,
+                    })
+        return violations
+
+
+def load_budgets(budgets_file):
+    """讀取效能預算設定檔（JSON），可為規則陣列或 {"budgets": [...]}"""
+    with open(budgets_file, 'r', encoding='utf-8') as f:
+        try:
+            config = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f'預算設定檔 JSON 解析失敗：{e}') from None
+    rules = config.get('budgets') if isinstance(config, dict) else config
+    if not isinstance(rules, list):
+        raise ValueError('預算設定檔需為規則陣列，或包含 "budgets" 陣列的物件')
+    return BudgetRules(rules)
+
+
+def _format_metric(metric, value):
+    if metric == 'errorRate':
+        return f'{value * 100:.2f}%'
+    return f'{value} ms'
+
+
+def _display_width(s):
+    """終端機顯示寬度：全形與寬字元（中文等）佔兩欄"""
+    import unicodedata
+
+    return sum(2 if unicodedata.east_asian_width(ch) in ('F', 'W') else 1 for ch in s)
+
+
+def print_budget_violations(violations):
+    """以文字表格列出所有預算違規項目（依顯示寬度對齊，含中文的欄位不會錯位）"""
+    labels = {metric: label for metric, label in BUDGET_LIMITS.values()}
+    rows = [('#', '名稱', '指標', '實際', '上限', '規則')]
+    rows += [(str(v['idx']), v['name'], labels[v['metric']], _format_metric(v['metric'], v['actual']),
+              _format_metric(v['metric'], v['limit']), v['rule']) for v in violations]
+    widths = [max(_display_width(row[c]) for row in rows) for c in range(len(rows[0]))]
+    for n, row in enumerate(rows):
+        print('  '.join(cell + ' ' * (w - _display_width(cell)) for cell, w in zip(row, widths)).rstrip())
+        if n == 0:
+            print('  '.join('-' * w for w in widths))
+
+
+class AssertionStats:
+    """逐筆累計各斷言的評估與失敗統計
+
+    to_dict() 回傳 items（每個斷言一筆）與 orders（各排序方式下的 items 索引），
+    排序在此預先計算，前端切換排序時不需重新比較。
+    """
+
+    def __init__(self, items=None):
+        self.items = items or []
+        self._index = {item['name']: pos for pos, item in enumerate(self.items)}
+
+    def add(self, idx, executions, start=1):
+        """加入第 idx 筆結果的執行結果；start 為第一筆執行的序號（增量更新時接續先前的次數）"""
+        for n, execution in enumerate(executions, start):
+            if not isinstance(execution, dict):
+                continue
+            for name, passed in execution.items():
+                pos = self._index.get(name)
+                if pos is None:
+                    pos = self._index[name] = len(self.items)
+                    self.items.append({'name': name, 'total': 0, 'failures': 0,
+                                       'requests': [], 'firstFail': None, 'lastFail': None})
+                item = self.items[pos]
+                item['total'] += 1
+                if passed is False:
+                    item['failures'] += 1
+                    requests = item['requests']
+                    if not requests or requests[-1] < idx:
+                        requests.append(idx)
+                    elif requests[-1] != idx:
+                        # 增量更新既有結果時 idx 可能小於最後一筆，維持遞增且不重複
+                        pos = bisect.bisect_left(requests, idx)
+                        if requests[pos] != idx:
+                            requests.insert(pos, idx)
+                    if item['firstFail'] is None or n < item['firstFail']:
+                        item['firstFail'] = n
+                    if item['lastFail'] is None or n > item['lastFail']:
+                        item['lastFail'] = n
+
+    def to_dict(self):
+        items = self.items
+        for item in items:
+            item['rate'] = round(item['failures'] / item['total'], 4) if item['total'] else 0
+        positions = range(len(items))
+        orders = {
+            'failures': sorted(positions, key=lambda i: (-items[i]['failures'], -items[i]['rate'], i)),
+            'rate': sorted(positions, key=lambda i: (-items[i]['rate'], -items[i]['failures'], i)),
+            'total': sorted(positions, key=lambda i: (-items[i]['total'], i)),
+            'requests': sorted(positions, key=lambda i: (-len(items[i]['requests']), -items[i]['failures'], i)),
+            'name': sorted(positions, key=lambda i: (items[i]['name'].casefold(), i)),
+        }
+        return {'items': items, 'orders': orders}
+
+    def merge(self, other):
+        """併入接續在後的另一段結果的統計；other 的結果序號須全部大於目前已有的序號
+
+        依段落順序合併時，斷言順序與受影響請求清單和逐筆累計的結果相同。
+        """
+        for item in other.items:
+            pos = self._index.get(item['name'])
+            if pos is None:
+                self._index[item['name']] = len(self.items)
+                self.items.append(item)
+                continue
+            mine = self.items[pos]
+            mine['total'] += item['total']
+            mine['failures'] += item['failures']
+            mine['requests'].extend(item['requests'])
+            if mine['firstFail'] is None or (item['firstFail'] is not None and item['firstFail'] < mine['firstFail']):
+                mine['firstFail'] = item['firstFail']
+            if mine['lastFail'] is None or (item['lastFail'] is not None and item['lastFail'] > mine['lastFail']):
+                mine['lastFail'] = item['lastFail']
+
+
+class ReportAccumulator:
+    """逐筆處理結果：補入 Method、評估效能預算，並累計摘要與斷言統計
+
+    單檔與分片輸出共用；分片模式另外建立表格索引列（build_index=True），
+    讓索引頁不需載入任何分片即可篩選與排序。
+    增量更新模式（track_requests=True）保留每個請求已處理的執行次數與可合併的統計，
+    可透過 to_state() / from_state() 存入狀態檔，之後只處理新增的結果與執行。
+    """
+
+    def __init__(self, budgets=None, build_index=False, track_requests=False):
+        self.budgets = budgets
+        self.method_map = {}
+        self.count = 0
+        self.times = Counter()
+        self.success = self.client_err = self.server_err = 0
+        self.total_tests = self.failed_tests = 0
+        self.assertions = AssertionStats()
+        self.budget_violations = {}
+        self.requests = {} if track_requests else None
+        self.rows = [] if build_index else None
+        self._test_names = {}
+        self._pending_methods = []
+
+    @property
+    def violations(self):
+        """所有預算違規（依結果順序），每項含 idx 與 name"""
+        return [v for idx in sorted(self.budget_violations) for v in self.budget_violations[idx]]
+
+    @property
+    def violating_requests(self):
+        return len(self.budget_violations)
+
+    def set_collection(self, collection):
+        """構建 Method 對照 (以 _method 欄位提供給前端使用)"""
+        try:
+            requests = (collection or {}).get('requests') or []
+            self.method_map = {req.get('id'): req.get('method') for req in requests if isinstance(req, dict)}
+        except Exception:
+            self.method_map = {}
+        # collection 出現在 results 之後時，補齊先前索引列的 Method
+        for pos, rid in self._pending_methods:
+            m = self.method_map.get(rid)
+            if m:
+                self.rows[pos][2] = m
+        self._pending_methods = []
+
+    def add(self, r):
+        """加入一筆新的結果"""
+        self.count += 1
+        if isinstance(r, dict):
+            _check_result(self.count, r)
+        else:
+            # 非物件的結果仍佔一列，索引列位置須與分片中的位置一致
+            if self.rows is not None:
+                self.rows.append([None, None, '—', None, None, None, 0, 0, 0, [], 0])
+            return
+        self._process(self.count, r, None)
+        if self.rows is not None:
+            self._add_row(r)
+
+    def update(self, idx, r):
+        """以更新後的匯出內容重新處理第 idx 筆既有結果（需 track_requests）
+
+        只累計先前未處理的執行；沒有新執行時回傳 None，
+        否則回傳 (新增的 times, 新增的 allTests) 供資料片段附加。
+        """
+        entry = self.requests.get(idx)
+        if entry is None or not isinstance(r, dict):
+            return None
+        _check_result(idx, r)
+        times, executions = _times(r), _executions(r)
+        if len(times) <= entry['times'] and len(executions) <= entry['executions']:
+            return None
+        # 扣除此結果先前對摘要的貢獻，再以目前的內容重新計入
+        self._count_summary(entry['summary'], -1)
+        self._process(idx, r, entry)
+        return times[entry['times']:], executions[entry['executions']:]
+
+    def _process(self, idx, r, entry):
+        if not r.get('_method'):
+            m = self.method_map.get(r.get('id'))
+            if m:
+                r['_method'] = m
+
+        times, executions = _times(r), _executions(r)
+        code = (r.get('responseCode') or {}).get('code')
+        tests = r.get('tests') or {}
+        summary = [r.get('time') or None, code if isinstance(code, (int, float)) else None,
+                   len(tests), sum(1 for v in tests.values() if v is False)]
+        self._count_summary(summary, 1)
+
+        if entry is None:
+            request_stats = RequestStats()
+            seen_times = seen_executions = 0
+        else:
+            request_stats = entry['stats']
+            if not isinstance(request_stats, RequestStats):
+                # 由狀態檔還原、尚未更新過的請求仍為原始形式，此時才建立計數表
+                request_stats = RequestStats(*request_stats)
+            seen_times, seen_executions = entry['times'], entry['executions']
+        request_stats.add(times[seen_times:], executions[seen_executions:])
+        self.assertions.add(idx, executions[seen_executions:], seen_executions + 1)
+        if self.requests is not None:
+            self.requests[idx] = {'stats': request_stats, 'summary': summary,
+                                  'times': len(times), 'executions': len(executions)}
+
+        if self.budgets:
+            found = self.budgets.evaluate(request_stats.stats(code), r.get('name'), r.get('url'))
+            if found:
+                r['_budgetViolations'] = found
+                self.budget_violations[idx] = [dict(v, idx=idx, name=r.get('name') or '—') for v in found]
+            else:
+                r.pop('_budgetViolations', None)
+                self.budget_violations.pop(idx, None)
+
+    def _count_summary(self, summary, sign):
+        """將單筆結果的 [耗時, 狀態碼, 測試數, 失敗測試數] 計入（sign=1）或扣除（sign=-1）摘要"""
+        time, code, tests, failed = summary
+        if time:
+            self.times[time] += sign
+            if not self.times[time]:
+                del self.times[time]
+        if code is not None:
+            if code < 400:
+                self.success += sign
+            elif code < 500:
+                self.client_err += sign
+            else:
+                self.server_err += sign
+        self.total_tests += sign * tests
+        self.failed_tests += sign * failed
+
+    def _add_row(self, r):
+        """索引列：[名稱, URL, Method, 狀態碼, 狀態名稱, 耗時, 通過, 失敗, 執行次數, 測試名稱索引, 預算違規]"""
+        method = r.get('_method') or r.get('method') or (r.get('request') or {}).get('method')
+        if not method:
+            if not self.method_map:
+                self._pending_methods.append((len(self.rows), r.get('id')))
+            method = '—'
+        rc = r.get('responseCode') or {}
+        tests = r.get('tests') or {}
+        names = [self._test_names.setdefault(k, len(self._test_names)) for k in tests]
+        self.rows.append([r.get('name'), r.get('url'), method, rc.get('code'), rc.get('name'), r.get('time'),
+                          sum(1 for v in tests.values() if v is True),
+                          sum(1 for v in tests.values() if v is False),
+                          len(_times(r)), names, r.get('_budgetViolations') or 0])
+
+    def merge(self, other):
+        """併入接續在後的一段結果的累計值（other 以 count=目前筆數起算，不含索引列）
+
+        平行序列化時各工作行程分段累計，主行程依段落順序合併；
+        耗時計數表的鍵順序與逐筆累計相同，平均值的浮點加總順序也因此一致。
+        """
+        self.count = other.count
+        self.times.update(other.times)
+        self.success += other.success
+        self.client_err += other.client_err
+        self.server_err += other.server_err
+        self.total_tests += other.total_tests
+        self.failed_tests += other.failed_tests
+        self.assertions.merge(other.assertions)
+        self.budget_violations.update(other.budget_violations)
+        if self.requests is not None:
+            self.requests.update(other.requests)
+
+    def summary(self):
+        """摘要卡片所需的數值；百分位數與前端原本的計算方式相同"""
+        n_times = sum(self.times.values())
+        summary = {
+            'count': self.count,
+            'success': self.success,
+            'clientErr': self.client_err,
+            'serverErr': self.server_err,
+            'avg': sum(t * c for t, c in self.times.items()) / (n_times or 1),
+            'p90': _percentile(self.times, 90),
+            'p95': _percentile(self.times, 95),
+            'totalTests': self.total_tests,
+            'failedTests': self.failed_tests,
+        }
+        if self.budgets:
+            summary['budget'] = {
+                'rules': len(self.budgets),
+                'violations': sum(len(v) for v in self.budget_violations.values()),
+                'requests': self.violating_requests,
+            }
+        return summary
+
+    def index(self):
+        return {'rows': self.rows, 'testNames': list(self._test_names)}
+
+    def to_state(self):
+        """可寫入狀態檔的累計值（需 track_requests）"""
+        return {
+            'count': self.count,
+            'times': list(self.times.items()),
+            'codes': [self.success, self.client_err, self.server_err],
+            'tests': [self.total_tests, self.failed_tests],
+            'assertions': self.assertions.items,
+            'violations': {str(idx): v for idx, v in self.budget_violations.items()},
+            'requests': {str(idx): [e['stats'].to_state() if isinstance(e['stats'], RequestStats) else e['stats'],
+                                    e['summary'], e['times'], e['executions']]
+                         for idx, e in self.requests.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state, budgets=None):
+        acc = cls(budgets, track_requests=True)
+        acc.count = state['count']
+        acc.times = Counter(dict(state['times']))
+        acc.success, acc.client_err, acc.server_err = state['codes']
+        acc.total_tests, acc.failed_tests = state['tests']
+        acc.assertions = AssertionStats(state['assertions'])
+        acc.budget_violations = {int(idx): v for idx, v in state['violations'].items()}
+        # 各請求的統計保留狀態檔中的原始形式，只有出現新執行的請求才還原為 RequestStats
+        acc.requests = {
+            int(idx): {'stats': stats, 'summary': summary, 'times': times, 'executions': executions}
+            for idx, (stats, summary, times, executions) in state['requests'].items()
+        }
+        return acc
+
+
+class _JsonStream:
+    """以固定大小的緩衝區逐段解析 JSON，不需一次將整個檔案載入記憶體"""
+
+    def __init__(self, f, chunk_size=1 << 20):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size):
+        data = self.f.read(size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """略過空白並回傳下一個字元（檔案結尾時回傳空字串）"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill(self.chunk_size):
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise ValueError(f'JSON 格式錯誤：預期 {ch!r}，位置附近內容為 {self.buf[self.pos:self.pos + 20]!r}')
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+                # 緩衝區結尾的數字可能被截斷，需確認後面還有內容
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # 每次讀取量至少與未解析的內容相同，避免大型值被重複解析過多次
+            self._fill(max(self.chunk_size, len(self.buf) - self.pos))
+
+
+def iter_postman_run(json_file):
+    """串流讀取 Postman 測試結果 JSON
+
+    依檔案順序產生 ('meta', 鍵, 值) 與 ('result', None, 結果)；
+    results 陣列逐筆解析，其餘頂層欄位整個解析。
+    """
+    with open(json_file, 'r', encoding='utf-8') as f:
+        stream = _JsonStream(f)
+        stream.expect('{')
+        if stream.peek() == '}':
+            return
+        while True:
+            key = stream.value()
+            stream.expect(':')
+            if key == 'results' and stream.peek() == '[':
+                stream.expect('[')
+                if stream.peek() == ']':
+                    stream.pos += 1
+                else:
+                    while True:
+                        yield 'result', None, stream.value()
+                        if stream.peek() == ',':
+                            stream.pos += 1
+                            continue
+                        stream.expect(']')
+                        break
+            else:
+                yield 'meta', key, stream.value()
+            if stream.peek() == ',':
+                stream.pos += 1
+                continue
+            stream.expect('}')
+            return
+
+
+class ShardWriter:
+    """將結果依序寫入固定筆數的資料分片 (shard-00001.js …)
+
+    每個分片為 window.__loadReportShard(分片序號, [...]) 呼叫，索引頁以 <script> 按需載入，
+    可直接以 file:// 開啟。結果逐筆寫出，記憶體用量不超過單筆結果。
+    """
+
+    def __init__(self, directory, shard_size):
+        self.directory = directory
+        self.shard_size = shard_size
+        self.count = 0
+        self.shards = 0
+        self._file = None
+
+    def add(self, result):
+        if self.count % self.shard_size == 0:
+            self._close_shard()
+            path = os.path.join(self.directory, shard_file_name(self.shards))
+            self._file = open(path, 'w', encoding='utf-8')
+            self._file.write(f'window.__loadReportShard({self.shards}, [\n')
+            self.shards += 1
+        else:
+            self._file.write(',\n')
+        self._file.write(json.dumps(result, ensure_ascii=False, separators=(',', ':')))
+        self.count += 1
+
+    def _close_shard(self):
+        if self._file:
+            self._file.write('\n]);\n')
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        self._close_shard()
+
+
+def shard_file_name(k):
+    return f'shard-{k + 1:05d}.js'
+
+
+def _report_title(test_data):
+    """產生標題：name + startedAt(YYYY-MM-DD)，回傳 (name, date_str)"""
+    name = test_data.get('name') or '未命名'
+    started_at = test_data.get('startedAt')
+    date_str = '—'
+    try:
+        if started_at:
+            from datetime import datetime
+
+            dt = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
+            date_str = dt.strftime('%Y-%m-%d')
+    except Exception:
+        pass
+    return name, date_str
+
+
+def _sanitize_filename(s):
+    allow = set(" -_().")
+    return ''.join(ch if (ch.isalnum() or ch in allow) else '_' for ch in s).strip(' ._') or 'report'
+
+
+def _read_sharded(json_file, stats, base_dir, shard_size):
+    """串流讀取結果並寫入暫存分片目錄，回傳 (不含 results、collection 的測試資料, 暫存目錄, 分片數)"""
+    import shutil
+    import tempfile
+
+    meta = {}
+    tmp_dir = tempfile.mkdtemp(prefix='.report-shards-', dir=base_dir)
+    writer = ShardWriter(tmp_dir, shard_size)
+    try:
+        for kind, key, value in iter_postman_run(json_file):
+            if kind == 'result':
+                stats.add(value)
+                writer.add(value)
+            else:
+                if key == 'collection':
+                    # 集合只用於補入 Method（已寫入索引列與分片），索引頁不嵌入
+                    stats.set_collection(value)
+                else:
+                    meta[key] = value
+        _check_run(meta)
+        writer.close()
+    except BaseException:
+        writer.close()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    meta['results'] = []
+    return meta, tmp_dir, writer.shards
+
+
+def _replace_shard_dir(tmp_dir, shard_dir):
+    """以新產生的分片目錄取代舊目錄（只移除先前產生的分片檔）"""
+    if os.path.isdir(shard_dir):
+        for entry in os.listdir(shard_dir):
+            if entry.startswith('shard-') and entry.endswith('.js'):
+                os.remove(os.path.join(shard_dir, entry))
+        os.rmdir(shard_dir)
+    os.replace(tmp_dir, shard_dir)
+
+
+# HTML 模板：JS 區塊中的 '{{' / '}}' 用於避開 Python 格式化，匯入時統一轉回 '{' / '}'
+HTML_TEMPLATE = '''<!DOCTYPE html>
+<html lang="zh-Hant">
+<head>
+  <meta charset="UTF-8" />
+  <title>REPORT_TITLE_PLACEHOLDER</title>
+  <meta name="viewport" content="width=device-width,initial-scale=1" />
+  <style>
+    :root {
+      --bg:#0f1115;
+      --panel:#1b1f27;
+      --panel-alt:#242a34;
+      --text:#eef2f7;
+      --text-dim:#a9b4c4;
+      --primary:#3b82f6;
+      --success:#10b981;
+      --warn:#f59e0b;
+      --error:#ef4444;
+      --border:#2c3542;
+      --code:#0d1117;
+      --badge:#334155;
+      --radius:10px;
+      --mono: ui-monospace, SFMono-Regular, Menlo, Consolas, "Courier New", monospace;
+      font-family: "Segoe UI", "Noto Sans TC", system-ui, -apple-system, BlinkMacSystemFont, Roboto, "Helvetica Neue", Arial, sans-serif;
+    }
+    * { box-sizing: border-box; }
+    body {
+      margin:0;
+      background:linear-gradient(145deg,#10141b,#0b0d11);
+      color:var(--text);
+      -webkit-font-smoothing: antialiased;
+    }
+    h1,h2,h3 { font-weight:600; letter-spacing:.5px; margin:0 0 .75rem }
+    a { color:var(--primary); text-decoration:none }
+    a:hover { text-decoration:underline }
+    .container {
+      max-width: 1480px;
+      margin: 0 auto;
+      padding: 1.8rem 2.2rem 4rem;
+    }
+    header { display:flex; flex-wrap:wrap; gap:1rem; align-items:flex-end; justify-content:space-between; }
+    header h1 { font-size: clamp(1.65rem, 2.2vw, 2.3rem); background:linear-gradient(90deg,#70a5ff,#c084fc); -webkit-background-clip:text; color:transparent; }
+    .meta-line { font-size:.9rem; color:var(--text-dim); }
+    .grid {
+      display:grid;
+      gap:1.25rem;
+      grid-template-columns: repeat(auto-fill,minmax(210px,1fr));
+      margin-bottom:1.75rem;
+    }
+    .card {
+      background:linear-gradient(145deg,#1d232d,#161b22);
+      border:1px solid var(--border);
+      padding:1rem 1.1rem .95rem;
+      border-radius:var(--radius);
+      position:relative;
+      overflow:hidden;
+    }
+    .card:before {
+      content:"";
+      position:absolute;
+      inset:0;
+      background:
+        radial-gradient(circle at 120% -10%, rgba(59,130,246,.18), transparent 60%),
+        radial-gradient(circle at -10% 120%, rgba(168,85,247,.15), transparent 70%);
+      opacity:.5;
+      pointer-events:none;
+    }
+    .card h3 {
+      font-size:.8rem;
+      text-transform:uppercase;
+      letter-spacing:.1em;
+      margin:0 0 .35rem;
+      color:var(--text-dim);
+    }
+    .card .value {
+      font-size:1.6rem;
+      font-weight:600;
+      line-height:1.15;
+    }
+    .value.sm { font-size:1.2rem; }
+    .tagline { font-size:.7rem; text-transform:uppercase; letter-spacing: .12em; color:var(--text-dim); margin-top:.25rem }
+    .value.ok { color:var(--success); }
+    .value.err { color:var(--error); }
+    .value.warn { color:var(--warn); }
+    .flex { display:flex; gap:.65rem; align-items:center; flex-wrap:wrap; }
+    .filters {
+      display:flex;
+      flex-wrap:wrap;
+      gap:.75rem;
+      padding:1rem 1.25rem;
+      background:linear-gradient(145deg,#1d2530,#141a21);
+      border:1px solid var(--border);
+      border-radius:var(--radius);
+      margin-bottom:1.25rem;
+    }
+    .filters label {
+      font-size:.7rem;
+      text-transform:uppercase;
+      letter-spacing:.12em;
+      color:var(--text-dim);
+      display:block;
+      margin-bottom:.25rem;
+    }
+    .filters .group {
+      display:flex;
+      flex-direction:column;
+      min-width: 160px;
+    }
+    .filters input, .filters select {
+      background:#10151c;
+      border:1px solid #2a333f;
+      color:var(--text);
+      padding:.55rem .6rem;
+      border-radius:6px;
+      font-size:.85rem;
+      min-width: 160px;
+    }
+    .filters input:focus, .filters select:focus {
+      outline:1px solid var(--primary);
+    }
+    .badge {
+      display:inline-flex;
+      padding:.28rem .55rem .32rem;
+      border-radius: 6px;
+      font-size:.65rem;
+      font-weight:600;
+      letter-spacing:.05em;
+      background:var(--badge);
+      color:var(--text-dim);
+      text-transform:uppercase;
+      white-space:nowrap;
+      gap:.35rem;
+      align-items:center;
+    }
+    .badge.GET { background:#1e3a8a; color:#93c5fd; }
+    .badge.PATCH { background:#4d194d; color:#fbcfe8; }
+    .badge.POST { background:#0f4d25; color:#6ee7b7; }
+    .badge.DELETE { background:#5b2121; color:#fecaca; }
+    .badge.budget { background:#5b0e17; color:#fda4af; margin-top:4px; }
+    .status-chip {
+      font-size:.65rem;
+      font-weight:600;
+      padding:.4rem .55rem;
+      border-radius:6px;
+      background:#334155;
+      color:#cbd5e1;
+      letter-spacing:.05em;
+      display:inline-block;
+      white-space:nowrap;
+    }
+    .status-2xx { background:#064e3b; color:#6ee7b7; }
+    .status-4xx { background:#5b1d0e; color:#fdba74; }
+    .status-5xx { background:#5b0e17; color:#fda4af; }
+    table {
+      width:100%;
+      border-collapse:separate;
+      border-spacing:0 6px;
+    }
+    thead th {
+      font-size:.7rem;
+      font-weight:600;
+      text-transform:uppercase;
+      letter-spacing:.1em;
+      text-align:left;
+      padding:.55rem .75rem;
+      color:var(--text-dim);
+    }
+    tbody tr {
+      background:linear-gradient(145deg,#1d232d,#161b22);
+      transition:background .2s, transform .2s;
+      cursor:pointer;
+    }
+    tbody tr:hover {
+      background:#243040;
+    }
+    tbody tr.budget-fail td:first-child {
+      box-shadow: inset 3px 0 0 var(--error);
+    }
+    tbody td {
+      padding:.65rem .75rem;
+      font-size:.8rem;
+      border-top:1px solid #2b3644;
+      border-bottom:1px solid #2b3644;
+    }
+    tbody tr td:first-child {
+      border-left:1px solid #2b3644;
+      border-top-left-radius:8px;
+      border-bottom-left-radius:8px;
+    }
+    tbody tr td:last-child {
+      border-right:1px solid #2b3644;
+      border-top-right-radius:8px;
+      border-bottom-right-radius:8px;
+    }
+    .mono { font-family:var(--mono); font-size:.75rem; }
+    .dim { color:var(--text-dim); }
+    .tests-badge {
+      font-size:.6rem;
+      background:#334155;
+      color:#cbd5e1;
+      padding:.28rem .5rem;
+      border-radius:999px;
+      font-weight:600;
+      letter-spacing:.05em;
+      display:inline-flex;
+      gap:.3rem;
+    }
+    .tests-badge .ok { color:var(--success); }
+    .tests-badge .fail { color:var(--error); }
+    .expand {
+      max-height:0;
+      overflow:hidden;
+      transition:max-height .35s ease;
+    }
+    .row.open + .expand {
+      max-height: 600px;
+    }
+    .detail-panel {
+      background:linear-gradient(135deg,#202733,#151a22);
+      border:1px solid #2c3644;
+      margin: -4px 4px 10px;
+      padding: 1rem 1rem 1.1rem;
+      border-radius:8px;
+      display:grid;
+      gap:1rem;
+      grid-template-columns:repeat(auto-fit,minmax(250px,1fr));
+      position:relative;
+    }
+    .detail-panel:before {
+      content:"";
+      position:absolute;
+      inset:0;
+      background:
+        radial-gradient(circle at 80% 20%, rgba(59,130,246,.12), transparent 65%),
+        radial-gradient(circle at 10% 90%, rgba(168,85,247,.12), transparent 70%);
+      opacity:.7;
+      pointer-events:none;
+    }
+    .detail-box h4 {
+      margin:0 0 .5rem;
+      font-size:.75rem;
+      letter-spacing:.1em;
+      text-transform:uppercase;
+      color:var(--text-dim);
+    }
+    ul.test-list {
+      list-style:none;
+      margin:0;
+      padding:0;
+      display:flex;
+      flex-direction:column;
+      gap:.4rem;
+      max-height:220px;
+      overflow:auto;
+      -webkit-mask-image:linear-gradient(#000, #000, rgba(0,0,0,.2));
+    }
+    ul.test-list li {
+      display:flex;
+      align-items:center;
+      gap:.5rem;
+      font-size:.7rem;
+      background:#12171e;
+      padding:.45rem .55rem;
+      border:1px solid #2b3644;
+      border-radius:6px;
+      line-height:1.3;
+    }
+    .pill {
+      font-size:.55rem;
+      font-weight:600;
+      letter-spacing:.08em;
+      padding:.25rem .45rem;
+      border-radius:5px;
+      text-transform:uppercase;
+    }
+    .pill.pass {
+      background:#064e3b;
+      color:#6ee7b7;
+    }
+    .pill.fail {
+      background:#5b0e17;
+      color:#fda4af;
+    }
+    code.inline {
+      background:#0f1620;
+      padding:.15rem .35rem;
+      border-radius:4px;
+      border:1px solid #1f2732;
+      font-family:var(--mono);
+      font-size:.68rem;
+      color:#91c7ff;
+    }
+    .times-chips {
+      display:flex;
+      flex-wrap:wrap;
+      gap:.4rem;
+    }
+    .chip {
+      font-size:.55rem;
+      background:#1e2936;
+      border:1px solid #314152;
+      color:#9fb2c7;
+      padding:.35rem .5rem;
+      border-radius:5px;
+      font-family:var(--mono);
+    }
+    .chip.fast { border-color:#065f46; color:#6ee7b7; }
+    .chip.slow { border-color:#92400e; color:#fbbf24; }
+    .chip.bad { border-color:#7f1d1d; color:#fca5a5; }
+    .legend {
+      display:flex;
+      gap:.75rem;
+      flex-wrap:wrap;
+      font-size:.6rem;
+      margin-top:.25rem;
+    }
+    .legend span {
+      display:inline-flex;
+      gap:.3rem;
+      align-items:center;
+      background:#16202b;
+      padding:.35rem .55rem;
+      border-radius:5px;
+      border:1px solid #293541;
+    }
+    .assertions {
+      padding:1rem 1.25rem;
+      background:linear-gradient(145deg,#1d2530,#141a21);
+      border:1px solid var(--border);
+      border-radius:var(--radius);
+      margin-bottom:1.25rem;
+    }
+    .assertions summary {
+      cursor:pointer;
+      font-size:.8rem;
+      letter-spacing:.1em;
+      text-transform:uppercase;
+      color:var(--text-dim);
+      font-weight:600;
+    }
+    .assertions .scroll {
+      max-height:360px;
+      overflow:auto;
+      margin-top:.75rem;
+    }
+    .assertions thead th[data-sort] { cursor:pointer; }
+    .assertions thead th.active { color:var(--primary); }
+    .assertions tbody tr { cursor:default; }
+    .chip.jump { cursor:pointer; }
+    .chip.jump:hover { border-color:var(--primary); color:#93c5fd; }
+    .chip.scope { border-color:var(--primary); color:#93c5fd; }
+    footer {
+      margin-top:3rem;
+      padding:2rem 0 1rem;
+      font-size:.65rem;
+      text-align:center;
+      color:#475569;
+    }
+    .no-results {
+      text-align:center;
+      padding:2rem 1rem;
+      color:var(--text-dim);
+      font-size:.85rem;
+    }
+    .pointer { cursor:pointer; }
+    .sticky-head {
+      position:sticky;
+      top:0;
+      backdrop-filter: blur(6px);
+      background:rgba(15,18,24,.85);
+      z-index:10;
+    }
+    @media (max-width: 880px) {
+      thead { display:none; }
+      table, tbody, tr, td { display:block; width:100%; }
+      tbody tr { margin-bottom:8px; border-radius:8px; }
+      tbody td {
+        border:none !important;
+        padding:.4rem .9rem .4rem;
+      }
+      tbody td[data-label]:before {
+        content: attr(data-label);
+        display:block;
+        font-size:.55rem;
+        letter-spacing:.1em;
+        text-transform:uppercase;
+        color:var(--text-dim);
+        margin-bottom:.15rem;
+      }
+    }
+  </style>
+</head>
+<body>
+  <div class="container">
+    <header>
+      <div>
+        <h1>REPORT_TITLE_PLACEHOLDER</h1>
+        <div class="meta-line" id="runMeta"></div>
+        <div class="legend">
+          <span><strong style="color:#6ee7b7">2xx</strong> 成功</span>
+          <span><strong style="color:#fdba74">4xx</strong> 用戶端錯誤</span>
+          <span><strong style="color:#fca5a5">5xx</strong> 服務端錯誤</span>
+          <span><strong style="color:#6ee7b7">PASS</strong> 測試通過</span>
+          <span><strong style="color:#fca5a5">FAIL</strong> 測試失敗</span>
+        </div>
+      </div>
+    </header>
+
+    <section class="grid" id="summaryCards"></section>
+
+    <details class="assertions" id="assertionSection" open>
+      <summary>斷言失敗分析 <span class="dim" id="assertionMeta"></span></summary>
+      <div class="scroll">
+        <table>
+          <thead>
+            <tr>
+              <th data-sort="name">斷言</th>
+              <th data-sort="total">評估次數</th>
+              <th data-sort="failures">失敗</th>
+              <th data-sort="rate">失敗率</th>
+              <th data-sort="requests">受影響請求</th>
+              <th>首次 / 最後失敗執行</th>
+            </tr>
+          </thead>
+          <tbody id="assertionBody"></tbody>
+        </table>
+      </div>
+    </details>
+
+    <section class="filters">
+      <div class="group">
+        <label for="search">關鍵字</label>
+          <input id="search" placeholder="名稱 / URL / 測試名稱" />
+      </div>
+      <div class="group">
+        <label for="methodFilter">Method</label>
+        <select id="methodFilter">
+          <option value="">全部</option>
+        </select>
+      </div>
+      <div class="group">
+        <label for="statusFilter">HTTP 狀態</label>
+        <select id="statusFilter">
+          <option value="">全部</option>
+          <option value="2">2xx</option>
+          <option value="4">4xx</option>
+          <option value="5">5xx</option>
+        </select>
+      </div>
+      <div class="group">
+        <label for="testResultFilter">測試結果</label>
+        <select id="testResultFilter">
+          <option value="">全部</option>
+          <option value="pass">全通過</option>
+          <option value="fail">含失敗</option>
+        </select>
+      </div>
+      <div class="group">
+        <label for="sortSelect">排序</label>
+        <select id="sortSelect">
+          <option value="seq">原始順序</option>
+          <option value="time-desc">耗時 (高→低)</option>
+          <option value="time-asc">耗時 (低→高)</option>
+          <option value="tests-desc">測試數 (多→少)</option>
+          <option value="tests-asc">測試數 (少→多)</option>
+          <option value="status">狀態碼</option>
+          <option value="name">名稱 A→Z</option>
+        </select>
+      </div>
+      <div class="group">
+        <label for="slowThreshold">慢速閾值(ms)</label>
+        <input id="slowThreshold" type="number" value="500" min="0" />
+      </div>
+      <div class="group" id="rowScopeGroup" style="display:none">
+        <label>限定列</label>
+        <span class="chip jump scope" id="rowScope" title="點擊清除限定">—</span>
+      </div>
+    </section>
+
+    <section id="tableSection">
+      <table>
+        <thead class="sticky-head">
+          <tr>
+            <th>#</th>
+            <th>名稱 / URL</th>
+            <th>Method</th>
+            <th>狀態</th>
+            <th>耗時 (ms)</th>
+            <th>測試通過</th>
+            <th>測試失敗</th>
+            <th>執行次數</th>
+          </tr>
+        </thead>
+        <tbody id="resultBody"></tbody>
+      </table>
+      <div id="noResults" class="no-results" style="display:none">無符合條件的結果</div>
+    </section>
+
+    <footer>
+      產生時間：<span id="generatedAt"></span>｜此頁面為離線報告，資料來源於提供之 JSON
+    </footer>
+  </div>
+
+  <script>
+    // 完整的測試數據直接嵌入
+    const testData = {json_data_placeholder};
+
+    const BUDGET_LABELS = {{ p95:'P95', p99:'P99', avg:'平均', errorRate:'錯誤率' }};
+
+    function formatBudgetViolation(v){{
+      const fmt = x => v.metric==='errorRate' ? (x*100).toFixed(2)+'%' : x+' ms';
+      return `${{BUDGET_LABELS[v.metric]||v.metric}} ${{fmt(v.actual)}} > ${{fmt(v.limit)}}（${{v.rule}}）`;
+    }}
+
+    function classifyTime(t, slow){{
+      if(t <= 120) return 'fast';
+      if(t >= slow) return 'bad';
+      return 'slow';
+    }}
+
+    function buildSummary(data, summary){{
+      const {{ count, success, clientErr, serverErr, avg, p90, p95, totalTests, failedTests }} = summary;
+      const passTests = totalTests - failedTests;
+
+      const cards = [
+        {{ title:'請求總數', value:count }},
+        {{ title:'成功請求', value:success, cls:'ok', sub:`${{(success/count*100).toFixed(1)}}%` }},
+          {{ title:'4xx', value:clientErr, cls: clientErr?'warn':'', sub: clientErr? ((clientErr/count*100).toFixed(1)+'%') : '—' }},
+        {{ title:'5xx', value:serverErr, cls: serverErr?'err':'', sub: serverErr? ((serverErr/count*100).toFixed(1)+'%') : '—' }},
+        {{ title:'平均耗時', value:avg.toFixed(1)+' ms' }},
+        {{ title:'P90', value:p90+' ms' }},
+        {{ title:'P95', value:p95+' ms' }},
+        {{ title:'測試通過', value:passTests, cls:'ok', sub:`${{passTests}}/${{totalTests}}` }},
+        {{ title:'測試失敗', value:failedTests, cls:failedTests?'err':'', sub: totalTests? ((failedTests/totalTests*100).toFixed(1)+'%') : '0%' }},
+      ];
+      if(summary.budget){{
+        const b = summary.budget;
+        cards.push({{ title:'效能預算違規', value:b.violations, cls:b.violations?'err':'ok', sub:`${{b.requests}} 個請求 / ${{b.rules}} 條規則` }});
+      }}
+
+      const wrap = document.getElementById('summaryCards');
+      wrap.innerHTML = cards.map(c=>`
+        <div class="card">
+          <h3>${{c.title}}</h3>
+          <div class="value ${{c.cls||''}}">${{c.value}}</div>
+          ${{c.sub? `<div class="tagline">${{c.sub}}</div>`:''}}
+        </div>
+      `).join('');
+      const metaEl = document.getElementById('runMeta');
+      if(data.startedAt && data.timestamp){{
+        const started = new Date(data.startedAt);
+        const ended = new Date(data.timestamp);
+        const dur = (ended - started)/1000;
+        metaEl.textContent = `集合：${{data.name || '未命名'}} ｜ 開始：${{started.toLocaleString()}} ｜ 結束：${{ended.toLocaleString()}} ｜ 總耗時：${{dur.toFixed(1)}}s`;
+      }}
+      document.getElementById('generatedAt').textContent = new Date().toLocaleString();
+    }}
+
+    function renderAssertions(stats, sortKey){{
+      const body = document.getElementById('assertionBody');
+      const order = stats.orders[sortKey] || stats.orders.failures;
+      const failing = stats.items.filter(a=>a.failures>0).length;
+      document.getElementById('assertionMeta').textContent = `｜${{stats.items.length}} 個斷言，${{failing}} 個曾失敗`;
+      document.querySelectorAll('#assertionSection th[data-sort]').forEach(th=>{{
+        th.classList.toggle('active', th.dataset.sort===sortKey);
+      }});
+      const MAX_JUMPS = 20;
+      body.innerHTML = order.map(i=>{{
+        const a = stats.items[i];
+        const jumps = a.requests.slice(0, MAX_JUMPS).map(idx=>`<span class="chip jump" data-idx="${{idx}}">#${{idx}}</span>`).join('');
+        const more = a.requests.length > MAX_JUMPS
+          ? `<span class="chip jump scope" data-item="${{i}}" title="在表格中只顯示全部 ${{a.requests.length}} 個受影響請求">+${{a.requests.length - MAX_JUMPS}}</span>`
+          : '';
+        return `<tr>
+          <td data-label="斷言">${{a.name.replace(/✅/g,'').trim()}}</td>
+          <td data-label="評估次數">${{a.total}}</td>
+          <td data-label="失敗" style="color:${{a.failures? 'var(--error)':'var(--text-dim)'}}">${{a.failures}}</td>
+          <td data-label="失敗率">${{(a.rate*100).toFixed(1)}}%</td>
+          <td data-label="受影響請求"><div class="times-chips">${{jumps + more || '<span class="dim">—</span>'}}</div></td>
+          <td data-label="首次 / 最後失敗執行" class="mono">${{a.firstFail===null ? '—' : `#${{a.firstFail}} / #${{a.lastFail}}`}}</td>
+        </tr>`;
+      }}).join('') || '<tr><td colspan="6" class="dim">無斷言記錄</td></tr>';
+    }}
+
+    // 限定表格只顯示指定的列（0 起算的列位置）；null 表示不限定
+    let rowScope = null;
+
+    function setRowScope(positions, label){{
+      rowScope = positions;
+      document.getElementById('rowScopeGroup').style.display = positions ? '' : 'none';
+      document.getElementById('rowScope').textContent = positions ? label + ' ✕' : '—';
+    }}
+
+    function clearFilters(){{
+      ['search','methodFilter','statusFilter','testResultFilter'].forEach(id => document.getElementById(id).value = '');
+    }}
+
+    // 只顯示某斷言全部的受影響請求（不受跳轉 chip 數量上限限制）
+    function showAssertionRows(data, a){{
+      clearFilters();
+      setRowScope(a.requests.map(idx => idx - 1), `斷言「${{a.name.replace(/✅/g,'').trim()}}」失敗的 ${{a.requests.length}} 個請求`);
+      renderTable(data).then(rendered => {{
+        if(rendered) document.getElementById('tableSection').scrollIntoView({{ behavior:'smooth', block:'start' }});
+      }});
+    }}
+
+    function jumpToRow(data, idx){{
+      // 清除篩選條件與限定列，確保目標列會被渲染
+      clearFilters();
+      setRowScope(null);
+      document.getElementById('sortSelect').value = 'seq';
+      renderTable(data).then(rendered => {{
+        const row = rendered && document.getElementById('row-'+idx);
+        if(!row) return;
+        row.click();
+        row.scrollIntoView({{ behavior:'smooth', block:'center' }});
+      }});
+    }}
+
+    function initAssertions(data, stats){{
+      let sortKey = 'failures';
+      renderAssertions(stats, sortKey);
+      document.querySelectorAll('#assertionSection th[data-sort]').forEach(th=>{{
+        th.addEventListener('click', ()=>{{
+          sortKey = th.dataset.sort;
+          renderAssertions(stats, sortKey);
+        }});
+      }});
+      document.getElementById('assertionBody').addEventListener('click', e=>{{
+        const scope = e.target.closest('.chip.scope');
+        if(scope) return showAssertionRows(data, stats.items[+scope.dataset.item]);
+        const chip = e.target.closest('.chip.jump');
+        if(chip) jumpToRow(data, +chip.dataset.idx);
+      }});
+    }}
+
+    function initFilters(rows){{
+      const methodSet = new Set(rows.map(item => item.method));
+      const select = document.getElementById('methodFilter');
+      [...methodSet].filter(m => m && m !== '—').sort().forEach(m=>{{
+        const opt=document.createElement('option');
+        opt.value = m;
+        opt.textContent = m;
+        select.appendChild(opt);
+      }});
+    }}
+
+    // 表格列模型：只在載入時建立一次，之後的篩選 / 排序只回傳列索引
+    let reportRows = [];
+    let queryClient = null;
+
+    // 展開明細所需的欄位；分片模式下於展開時才從分片載入
+    function rowDetail(r){{
+      return {{
+        testsObj:r.tests || {{}},
+        times:r.times || (r.time?[r.time]:[]),
+        allTests:r.allTests || [],
+        raw:r
+      }};
+    }}
+
+    function buildRows(data){{
+      return data.results.map((r,i)=>{{
+        const detail = rowDetail(r);
+        const testsObj = detail.testsObj;
+        return Object.assign({{
+          idx:i+1,
+          name:r.name,
+          url:r.url,
+          method:r._method || r.method || (r.request && r.request.method) || '—',
+          status:r.responseCode?.code,
+          statusName:r.responseCode?.name,
+          time:r.time,
+          passCount:Object.values(testsObj).filter(v=>v===true).length,
+          failCount:Object.values(testsObj).filter(v=>v===false).length,
+          runs:detail.times.length,
+          testNames:Object.keys(testsObj),
+          budget:r._budgetViolations || []
+        }}, detail);
+      }});
+    }}
+
+    // 分片模式：由索引頁預先計算的索引列建立表格列（欄位順序見 ReportAccumulator._add_row）
+    function buildRowsFromIndex(index){{
+      return index.rows.map((row,i)=>{{
+        const [name, url, method, status, statusName, time, passCount, failCount, runs, names, budget] = row;
+        return {{
+          idx:i+1, name, url, method, status, statusName, time, passCount, failCount, runs,
+          testNames:names.map(n => index.testNames[n]),
+          budget:budget || [],
+          raw:null
+        }};
+      }});
+    }}
+
+    // 以 <script> 按需載入資料分片（可於 file:// 使用），每個分片只載入一次
+    const shardLoads = new Map();
+    const shardCallbacks = {{}};
+    window.__loadReportShard = (k, results) => {{
+      if(shardCallbacks[k]) shardCallbacks[k](results);
+    }};
+
+    function loadShard(index, k){{
+      if(!shardLoads.has(k)){{
+        shardLoads.set(k, new Promise((resolve, reject)=>{{
+          const script = document.createElement('script');
+          script.src = encodeURIComponent(index.shardDir) + '/shard-' + String(k+1).padStart(5,'0') + '.js';
+          shardCallbacks[k] = results => {{
+            delete shardCallbacks[k];
+            script.remove();
+            resolve(results);
+          }};
+          script.onerror = ()=>{{
+            delete shardCallbacks[k];
+            shardLoads.delete(k);
+            script.remove();
+            reject(new Error(`無法載入資料分片 ${{script.src}}`));
+          }};
+          document.head.appendChild(script);
+        }}));
+      }}
+      return shardLoads.get(k);
+    }}
+
+    function loadRowDetail(item){{
+      if(item.raw) return Promise.resolve(item);
+      const index = testData._index;
+      const pos = item.idx - 1;
+      return loadShard(index, Math.floor(pos / index.shardSize))
+        .then(results => Object.assign(item, rowDetail(results[pos % index.shardSize])));
+    }}
+
+    // 篩選 / 排序引擎使用的欄位式精簡模型（傳給 Worker 一次）
+    function buildQueryModel(rows){{
+      return {{
+        hay: rows.map(item => (item.name+' '+item.url+' '+item.testNames.join(' ')).toLowerCase()),
+        name: rows.map(item => item.name),
+        method: rows.map(item => item.method),
+        status: rows.map(item => item.status),
+        time: rows.map(item => item.time),
+        tests: rows.map(item => item.passCount + item.failCount),
+        fail: rows.map(item => item.failCount)
+      }};
+    }}
+
+    // 篩選 / 排序引擎：只依賴傳入的模型，原始碼會被序列化到 Worker 中執行，不可引用外部變數
+    function createQueryEngine(model){{
+      const collator = new Intl.Collator('zh-Hant');
+      return function run(q){{
+        const out = [];
+        // q.only：只在指定的列位置（遞增）中篩選，例如某斷言的受影響請求
+        const only = q.only;
+        const n = only ? only.length : model.hay.length;
+        for(let k=0; k<n; k++){{
+          const i = only ? only[k] : k;
+          if(q.search && !model.hay[i].includes(q.search)) continue;
+          if(q.method && model.method[i] !== q.method) continue;
+          if(q.statusCat && !String(model.status[i]).startsWith(q.statusCat)) continue;
+          if(q.testRes==='pass' && model.fail[i]>0) continue;
+          if(q.testRes==='fail' && model.fail[i]===0) continue;
+          out.push(i);
+        }}
+        const {{ time, tests, status, name }} = model;
+        switch(q.sort){{
+          case 'time-desc': out.sort((a,b)=>time[b] - time[a]); break;
+          case 'time-asc': out.sort((a,b)=>time[a] - time[b]); break;
+          case 'tests-desc': out.sort((a,b)=>tests[b] - tests[a]); break;
+          case 'tests-asc': out.sort((a,b)=>tests[a] - tests[b]); break;
+          case 'status': out.sort((a,b)=>status[a] - status[b]); break;
+          case 'name': out.sort((a,b)=>collator.compare(name[a], name[b])); break;
+          case 'seq':
+          default: // do nothing
+        }}
+        return out;
+      }};
+    }}
+
+    // 以 Blob URL 建立內嵌 Worker 執行查詢，報告仍維持單一離線檔案。
+    // 同一時間只有一個查詢在 Worker 中執行；期間的新查詢只保留最新一筆，
+    // 被取代的查詢直接以 null 結束，不會排隊等待。Worker 無法使用時改在主執行緒計算。
+    function createQueryClient(model){{
+      let worker = null;
+      let engine = null;
+      let inflight = null;
+      let queued = null;
+      let seq = 0;
+      const runLocal = query => (engine || (engine = createQueryEngine(model)))(query);
+
+      function dispatch(job){{
+        inflight = job;
+        worker.postMessage({{ type:'query', id:job.id, query:job.query }});
+      }}
+
+      function fallback(){{
+        if(worker) worker.terminate();
+        worker = null;
+        [inflight, queued].forEach(job => job && job.resolve(runLocal(job.query)));
+        inflight = queued = null;
+      }}
+
+      try {{
+        const src = `const createQueryEngine = ${{createQueryEngine.toString()}};
+let run = null;
+self.onmessage = e => {{
+  const msg = e.data;
+  if(msg.type === 'init'){{ run = createQueryEngine(msg.model); return; }}
+  const indices = Uint32Array.from(run(msg.query));
+  self.postMessage({{ id: msg.id, indices }}, [indices.buffer]);
+}};`;
+        const url = URL.createObjectURL(new Blob([src], {{ type:'text/javascript' }}));
+        worker = new Worker(url);
+        worker.postMessage({{ type:'init', model }});
+        worker.onmessage = e => {{
+          URL.revokeObjectURL(url);
+          const job = inflight;
+          inflight = null;
+          if(queued){{
+            // 已有更新的查詢：丟棄此結果，改送最新查詢
+            job.resolve(null);
+            const next = queued;
+            queued = null;
+            dispatch(next);
+          }} else {{
+            job.resolve(e.data.indices);
+          }}
+        }};
+        worker.onerror = e => {{
+          e.preventDefault();
+          URL.revokeObjectURL(url);
+          fallback();
+        }};
+      }} catch(e) {{
+        worker = null;
+      }}
+
+      return {{
+        run(query){{
+          return new Promise(resolve => {{
+            const job = {{ id: ++seq, query, resolve }};
+            if(!worker) return resolve(runLocal(query));
+            if(!inflight) return dispatch(job);
+            if(queued) queued.resolve(null);
+            queued = job;
+          }});
+        }}
+      }};
+    }}
+
+    function readQuery(){{
+      return {{
+        search: document.getElementById('search').value.trim().toLowerCase(),
+        method: document.getElementById('methodFilter').value,
+        statusCat: document.getElementById('statusFilter').value,
+        testRes: document.getElementById('testResultFilter').value,
+        sort: document.getElementById('sortSelect').value,
+        only: rowScope
+      }};
+    }}
+
+    // 每個影格最多執行一次：同一影格內重複排入的工作只保留最後一個
+    const requestFrame = window.requestAnimationFrame ? cb => window.requestAnimationFrame(cb) : cb => setTimeout(cb, 16);
+    const frameTasks = new Map();
+    function inNextFrame(key, task){{
+      if(!frameTasks.has(key)) requestFrame(()=>{{
+        const run = frameTasks.get(key);
+        frameTasks.delete(key);
+        run();
+      }});
+      frameTasks.set(key, task);
+    }}
+
+    // 表格重繪排入下一個影格：快速輸入或 Worker 連續回傳時，同一影格內只重建一次表格
+    let renderWaiters = [];
+    function scheduleRender(indices){{
+      return new Promise(resolve => {{
+        renderWaiters.push(resolve);
+        inNextFrame('rows', ()=>{{
+          const waiters = renderWaiters;
+          renderWaiters = [];
+          renderRows(indices);
+          waiters.forEach(done => done(true));
+        }});
+      }});
+    }}
+
+    // 依目前的篩選條件向查詢引擎取得列索引後渲染；被新查詢取代時不渲染
+    function renderTable(data){{
+      return queryClient.run(readQuery()).then(indices => indices ? scheduleRender(indices) : false);
+    }}
+
+    function currentSlowThreshold(){{
+      return +document.getElementById('slowThreshold').value || 500;
+    }}
+
+    // 慢速閾值只改變耗時的顏色：就地更新既有耗時元素（含已展開的明細）的 class，不重建表格
+    function applySlowThreshold(){{
+      const slow = currentSlowThreshold();
+      document.querySelectorAll('#resultBody [data-time]').forEach(el => {{
+        el.classList.remove('fast', 'slow', 'bad');
+        el.classList.add(classifyTime(+el.dataset.time, slow));
+      }});
+    }}
+
+    function renderRows(indices){{
+      const body = document.getElementById('resultBody');
+      const slowThreshold = currentSlowThreshold();
+      const list = Array.from(indices, i => reportRows[i]);
+
+      body.innerHTML = '';
+      if(!list.length){{
+        document.getElementById('noResults').style.display='block';
+        return;
+      }} else {{
+        document.getElementById('noResults').style.display='none';
+      }}
+
+      const frag = document.createDocumentFragment();
+
+      list.forEach(item=>{{
+        const tr = document.createElement('tr');
+        tr.className = item.budget.length ? 'row budget-fail' : 'row';
+        tr.id = 'row-'+item.idx;
+        const statusCls = item.status >=500 ? 'status-5xx' : item.status >=400 ? 'status-4xx' : 'status-2xx';
+
+        tr.innerHTML = `
+          <td data-label="#">${{item.idx}}</td>
+          <td data-label="名稱 / URL">
+            <div style="font-weight:600; font-size:.78rem; letter-spacing:.2px">${{item.name||'—'}}</div>
+            <div class="mono dim" style="margin-top:2px; word-break:break-all">
+              <a href="${{item.url.startsWith('http')? item.url : 'https://'+item.url}}" target="_blank">${{item.url}}</a>
+            </div>
+            ${{item.budget.length ? `<span class="badge budget" title="${{item.budget.map(formatBudgetViolation).join('\\n').replace(/"/g,'&quot;')}}">超出預算 ×${{item.budget.length}}</span>` : ''}}
+          </td>
+          <td data-label="Method">
+            <span class="badge ${{item.method}}">${{item.method}}</span>
+          </td>
+          <td data-label="狀態">
+            <span class="status-chip ${{statusCls}}">${{item.status}} ${{item.statusName||''}}</span>
+          </td>
+          <td data-label="耗時">
+            <span class="mono ${{classifyTime(item.time, slowThreshold)}}" data-time="${{item.time}}">${{item.time}}</span>
+          </td>
+          <td data-label="通過">${{item.passCount}}</td>
+          <td data-label="失敗" style="color:${{item.failCount? 'var(--error)':'var(--text-dim)'}}">${{item.failCount}}</td>
+          <td data-label="執行次數">${{item.runs}}</td>
+        `;
+        frag.appendChild(tr);
+
+        const expand = document.createElement('tr');
+        const td = document.createElement('td');
+        td.colSpan=8;
+        expand.className='expand';
+        expand.appendChild(td);
+        frag.appendChild(expand);
+
+        // 明細於第一次展開時才渲染（分片模式需先載入對應的資料分片）
+        tr.addEventListener('click', ()=>{{
+          tr.classList.toggle('open');
+          if(td.dataset.filled) return;
+          td.dataset.filled = '1';
+          td.innerHTML = '<div class="detail-panel"><div class="dim" style="font-size:.7rem">載入中…</div></div>';
+          loadRowDetail(item).then(
+            ()=>{{ td.innerHTML = renderDetail(item, currentSlowThreshold()); }},
+            err=>{{
+              td.dataset.filled = '';
+              td.innerHTML = `<div class="detail-panel"><div class="dim" style="font-size:.7rem">${{err.message}}</div></div>`;
+            }});
+        }});
+      }});
+
+      body.appendChild(frag);
+    }}
+
+    function renderDetail(item, slowThreshold){{
+      const timesChips = item.times.map(t=>{{
+        const cls = classifyTime(t, slowThreshold);
+        return `<span class="chip ${{cls}}" data-time="${{t}}">${{t}} ms</span>`;
+      }}).join('');
+
+      const testList = item.testNames.map(k=>{{
+        const pass = item.testsObj[k]===true;
+        return `<li>
+          <span class="pill ${{pass?'pass':'fail'}}">${{pass?'PASS':'FAIL'}}</span>
+          <span>${{k.replace(/✅/g,'').trim()}}</span>
+        </li>`;
+      }}).join('') || '<div class="dim" style="font-size:.65rem">無測試記錄</div>';
+
+      const executionsHTML = (item.allTests||[]).map((exec,i)=>{{
+        const execLines = Object.entries(exec).map(([k,v])=>{{
+          return `<div style="display:flex; gap:.5rem; align-items:center;">
+            <span class="pill ${{v?'pass':'fail'}}">${{v?'PASS':'FAIL'}}</span>
+            <code class="inline">${{k.replace(/✅/g,'').trim()}}</code>
+          </div>`;
+        }}).join('');
+        return `<div style="padding:.55rem .65rem; border:1px solid #2a3441; background:#12171e; border-radius:6px; display:grid; gap:.45rem">
+          <div style="font-size:.6rem; letter-spacing:.08em; color:var(--text-dim); font-weight:600;">執行 #${{i+1}}</div>
+          ${{execLines || '<div class="dim" style="font-size:.65rem">—</div>'}}
+        </div>`;
+      }}).join('<div style="height:6px"></div>') || '<div class="dim" style="font-size:.65rem">無</div>';
+
+      const budgetHTML = item.budget.length ? `
+          <div class="detail-box">
+            <h4>效能預算違規</h4>
+            <ul class="test-list">
+              ${{item.budget.map(v=>`<li>
+                <span class="pill fail">${{BUDGET_LABELS[v.metric]||v.metric}}</span>
+                <span>${{formatBudgetViolation(v)}}</span>
+              </li>`).join('')}}
+            </ul>
+          </div>` : '';
+
+      return `
+        <div class="detail-panel">
+          ${{budgetHTML}}
+          <div class="detail-box">
+            <h4>測試摘要</h4>
+            <ul class="test-list">
+              ${{testList}}
+            </ul>
+          </div>
+          <div class="detail-box">
+            <h4>耗時分佈 (${{item.times.length}})</h4>
+            <div class="times-chips">${{timesChips || '<div class="dim" style="font-size:.65rem">無</div>'}}</div>
+            <div style="margin-top:.65rem; font-size:.6rem; letter-spacing:.08em; text-transform:uppercase; color:var(--text-dim); font-weight:600;">統計</div>
+            <div style="font-size:.65rem; display:grid; gap:.25rem">
+              ${{(()=>{{
+                if(!item.times.length) return '<div class="dim">—</div>';
+                const min = Math.min(...item.times);
+                const max = Math.max(...item.times);
+                const avg = (item.times.reduce((a,b)=>a+b,0)/item.times.length).toFixed(2);
+                return `
+                  <div>最小：<code class="inline">${{min}} ms</code></div>
+                  <div>最大：<code class="inline">${{max}} ms</code></div>
+                  <div>平均：<code class="inline">${{avg}} ms</code></div>
+                `;
+              }})()}}
+            </div>
+          </div>
+          <div class="detail-box">
+            <h4>每次執行測試結果</h4>
+            <div style="display:flex; flex-direction:column; gap:.6rem; max-height:240px; overflow:auto;">
+              ${{executionsHTML}}
+            </div>
+          </div>
+          <div class="detail-box">
+            <h4>原始資料片段</h4>
+            <div style="font-size:.6rem; line-height:1.4; font-family:var(--mono); background:#0f1620; padding:.6rem .7rem; border:1px solid #243140; border-radius:6px; max-height:260px; overflow:auto; white-space:pre;">
+${{(()=> {{
+try {{
+  const clone = structuredClone(item.raw);
+  if(clone.allTests && clone.allTests.length > 3){{
+    clone.allTests = clone.allTests.slice(0,3);
+    clone._truncated = true;
+  }}
+  return JSON.stringify(clone,null,2)
+    .replace(/[&<>]/g,s=>({{\'&\':\'&amp;\',\'<\':\'&lt;\',\'>\':\'&gt;\'}}[s]));
+}} catch(e){{ return \'{{}}\'; }}
+}})()}}
+            </div>
+          </div>
+        </div>
+      `;
+    }}
+
+    function attachEvents(data){{
+      ['search','methodFilter','statusFilter','testResultFilter','sortSelect']
+        .forEach(id => document.getElementById(id).addEventListener('input', ()=> renderTable(data)));
+      document.getElementById('rowScope').addEventListener('click', ()=>{{
+        setRowScope(null);
+        renderTable(data);
+      }});
+      // 慢速閾值只影響顯示：每個影格最多就地更新一次耗時顏色
+      document.getElementById('slowThreshold').addEventListener('input', ()=> inNextFrame('slow', applySlowThreshold));
+    }}
+
+    function initReport(data){{
+      if(!data || !Array.isArray(data.results)){{
+        alert('資料格式錯誤：缺少 results 陣列');
+        return;
+      }}
+      buildSummary(data, reportSummary);
+      initAssertions(data, assertionStats);
+      reportRows = data._index ? buildRowsFromIndex(data._index) : buildRows(data);
+      initFilters(reportRows);
+      queryClient = createQueryClient(buildQueryModel(reportRows));
+      renderTable(data);
+      attachEvents(data);
+    }}
+
+    // 增量更新附加的資料片段：新增的結果，以及既有結果新增的執行
+    function appendReportData(results, patches){{
+      patches.forEach(p=>{{
+        const r = testData.results[p.idx-1];
+        Object.assign(r, p.set);
+        if(!r._budgetViolations) delete r._budgetViolations;
+        r.times = (r.times || []).concat(p.times);
+        r.allTests = (r.allTests || []).concat(p.allTests);
+      }});
+      results.forEach(r => testData.results.push(r));
+    }}
+
+    // 載入完整的測試數據
+    document.addEventListener('DOMContentLoaded', function() {{
+      initReport(testData);
+    }});
+  </script>
+{summary_segment_placeholder}  <script>
+    // 摘要區段（增量更新時只重寫此區段）：執行資訊、斷言統計與摘要數值皆由生成腳本預先計算
+    Object.assign(testData, {run_meta_placeholder});
+    const assertionStats = {assertion_stats_placeholder};
+    const reportSummary = {summary_placeholder};
+  </script>
+</body>
+</html>'''
+
+_TEMPLATE_SLOTS = re.compile(
+    r'REPORT_TITLE_PLACEHOLDER|\{(json_data|summary_segment|run_meta|assertion_stats|summary)_placeholder\}')
+
+
+def _compile_template(template):
+    """將模板拆成靜態片段與插入點，每個行程只在匯入時執行一次
+
+    回傳的清單中偶數位置為靜態 HTML（UTF-8 位元組），奇數位置為插入點名稱（title / json_data / …）。
+    大括號重寫在插入資料前完成，資料字串中的 '{{' / '}}' 不會被更動。
+    """
+    template = (template
+                .replace('${{', '${')
+                .replace('}}', '}')
+                .replace('{{', '{'))
+    parts = []
+    pos = 0
+    for m in _TEMPLATE_SLOTS.finditer(template):
+        parts.append(template[pos:m.start()].encode('utf-8'))
+        parts.append(m.group(1) or 'title')
+        pos = m.end()
+    parts.append(template[pos:].encode('utf-8'))
+    return parts
+
+
+_TEMPLATE_PARTS = _compile_template(HTML_TEMPLATE)
+_SUMMARY_SEGMENT = _TEMPLATE_PARTS.index('summary_segment')
+
+
+def _write_html(f, slots, start=0):
+    """依序寫出靜態片段與插入內容（f 為二進位檔），不在記憶體中組出完整 HTML 字串
+
+    start 可指定從摘要區段開始寫出；回傳摘要區段在檔案中的起始位置。
+    """
+    offset = None
+    for i in range(start, len(_TEMPLATE_PARTS)):
+        part = _TEMPLATE_PARTS[i]
+        if i % 2 == 0:
+            f.write(part)
+        elif part == 'summary_segment':
+            offset = f.tell()
+        else:
+            value = slots[part]
+            # 插入內容可為字串，或依序寫出的多個片段（平行序列化的各段結果）
+            for piece in ([value] if isinstance(value, str) else value):
+                f.write(piece.encode('utf-8'))
+    return offset
+
+
+def _summary_slots(test_data, stats):
+    """摘要區段的插入內容；執行資訊不含 results、collection 等大型欄位"""
+    run_meta = {k: v for k, v in test_data.items() if k not in ('results', 'collection', '_index')}
+    return {
+        'run_meta': json.dumps(run_meta, ensure_ascii=False),
+        'assertion_stats': json.dumps(stats.assertions.to_dict(), ensure_ascii=False, separators=(',', ':')),
+        'summary': json.dumps(stats.summary(), ensure_ascii=False),
+    }
+
+
+# json.dumps(test_data, indent=2) 中 results 陣列元素的換行與縮排（位於第二層）
+_RESULT_INDENT = '\n    '
+# 平行序列化時每段至少的結果筆數；結果不足兩段時直接以單一行程處理
+PARALLEL_MIN_CHUNK = 500
+_worker_context = None
+
+
+def _init_worker(method_map, budgets, track_requests):
+    """工作行程初始化：Method 對照與預算設定每個行程只傳送一次"""
+    global _worker_context
+    _worker_context = (method_map, budgets, track_requests)
+
+
+def _serialize_chunk(start, results):
+    """工作行程：處理並序列化一段連續的結果，回傳 (JSON 文字, 該段的累計值)
+
+    start 為此段之前的結果筆數；文字與完整 json.dumps(test_data, indent=2) 中
+    對應的陣列元素（含元素間的分隔）逐位元組相同。
+    """
+    method_map, budgets, track_requests = _worker_context
+    stats = ReportAccumulator(budgets, track_requests=track_requests)
+    stats.method_map = method_map
+    stats.count = start
+    pieces = []
+    for r in results:
+        stats.add(r)
+        pieces.append(json.dumps(r, ensure_ascii=False, indent=2).replace('\n', _RESULT_INDENT))
+    # 預算設定與 Method 對照主行程已有，不必傳回
+    stats.budgets = None
+    stats.method_map = {}
+    return (',' + _RESULT_INDENT).join(pieces), stats
+
+
+def _dump_parallel(test_data, stats, jobs):
+    """以行程池分段處理並序列化 results，依序合併各段統計；回傳依序寫出的字串片段
+
+    輸出與 json.dumps(test_data, ensure_ascii=False, indent=2) 逐位元組相同：
+    其餘欄位照常序列化，results 先以標記字串佔位，再替換為各段文字。
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    results = test_data['results']
+    size = max(PARALLEL_MIN_CHUNK, -(-len(results) // (jobs * 4)))
+    marker = json.dumps(f'__results_{os.urandom(8).hex()}__')
+    head, _, tail = json.dumps(dict(test_data, results=json.loads(marker)),
+                               ensure_ascii=False, indent=2).partition(marker)
+    starts = range(0, len(results), size)
+    parts = [head, '[' + _RESULT_INDENT]
+    with ProcessPoolExecutor(min(jobs, len(starts)), initializer=_init_worker,
+                             initargs=(stats.method_map, stats.budgets, stats.requests is not None)) as pool:
+        chunks = pool.map(_serialize_chunk, starts, (results[s:s + size] for s in starts))
+        for n, (text, chunk_stats) in enumerate(chunks):
+            if n:
+                parts.append(',' + _RESULT_INDENT)
+            parts.append(text)
+            stats.merge(chunk_stats)
+    parts.append('\n  ]' + tail)
+    return parts
+
+
+# 增量更新狀態檔格式版本；累計內容或 HTML 版面不相容時遞增
+STATE_VERSION = 1
+
+
+def _state_key(test_data, budgets):
+    """狀態檔適用條件：同一次執行、相同模板與預算設定"""
+    import hashlib
+
+    return {
+        'version': STATE_VERSION,
+        'template': hashlib.sha1(HTML_TEMPLATE.encode('utf-8')).hexdigest(),
+        'budgets': budgets.fingerprint if budgets else None,
+        'run': [test_data.get('id'), test_data.get('startedAt')],
+    }
+
+
+def _load_state(state_file, output_file, key, total_results):
+    """讀取並驗證狀態檔；與目前的報告、匯出或設定不符時回傳 None（改為完整重建）"""
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get('key') != key:
+        return None
+    try:
+        if os.path.getsize(output_file) != state['size']:
+            return None
+    except OSError:
+        return None
+    if total_results < state['accumulator']['count']:
+        return None
+    return state
+
+
+def _save_state(state_file, key, stats, summary_offset, size):
+    tmp_file = state_file + '.tmp'
+    # json.dumps 使用 C 編碼器；json.dump 寫入檔案時會改用純 Python 的逐段編碼，大型狀態檔慢數倍
+    state = json.dumps({'key': key, 'summaryOffset': summary_offset, 'size': size,
+                        'accumulator': stats.to_state()}, ensure_ascii=False, separators=(',', ':'))
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(state)
+    os.replace(tmp_file, state_file)
+
+
+def _append_to_report(output_file, summary_offset, stats, test_data):
+    """增量更新：只處理新增的結果與既有結果的新執行
+
+    於摘要區段前附加一個資料片段，再重寫摘要區段；回傳 (新摘要區段位置, 檔案大小, 新增筆數, 更新筆數)。
+    """
+    stats.set_collection(test_data.get('collection'))
+    results = test_data.get('results') or []
+    processed = stats.count
+    patches = []
+    for idx, r in enumerate(results[:processed], 1):
+        grown = stats.update(idx, r)
+        if grown:
+            times, executions = grown
+            changed = {k: v for k, v in r.items() if k not in ('times', 'allTests')}
+            changed['_budgetViolations'] = r.get('_budgetViolations')
+            patches.append({'idx': idx, 'set': changed, 'times': times, 'allTests': executions})
+    added = results[processed:]
+    for r in added:
+        stats.add(r)
+
+    with open(output_file, 'r+b') as f:
+        f.seek(summary_offset)
+        f.truncate()
+        if added or patches:
+            segment = (f'<script>appendReportData('
+                       f'{json.dumps(added, ensure_ascii=False)}, '
+                       f'{json.dumps(patches, ensure_ascii=False)});</script>\n')
+            f.write(segment.encode('utf-8'))
+        summary_offset = f.tell()
+        _write_html(f, _summary_slots(test_data, stats), _SUMMARY_SEGMENT + 1)
+        size = f.tell()
+    return summary_offset, size, len(added), len(patches)
+
+
+def generate_html_report(json_file, budgets=None, shard_size=None, output_dir=None, verbose=True,
+                         incremental=False, jobs=1):
+    """生成包含完整 JSON 數據的 HTML 報告
+
+    若提供 budgets（BudgetRules），會標記超出效能預算的請求並回傳違規清單。
+    若提供 shard_size，改為輸出輕量索引頁與每 shard_size 筆結果一個的資料分片，
+    讀取時以串流方式逐筆處理，記憶體用量不隨結果總數成長。
+    若 incremental 為真，於報告旁保存狀態檔（.state.json）；之後對同一次執行的更新匯出
+    只處理新增的結果與執行，附加資料片段並重寫摘要區段，不重建整份報告。
+    jobs 大於 1 時，單檔輸出以行程池分段處理並序列化 results（各段統計於最後合併），
+    輸出與單一行程逐位元組相同；jobs 為 0 表示使用所有 CPU。
+    output_dir 預設為本資料夾的上一層，不存在時自動建立。
+
+    回傳 {'output', 'results', 'shards', 'violations', 'appended', 'updated'}；
+    appended / updated 為增量更新時新增與更新的結果筆數，完整生成時為 None。
+    """
+    if incremental and shard_size:
+        raise ValueError('增量更新不支援分片輸出')
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    base_dir = os.path.abspath(output_dir or os.path.join(os.path.dirname(__file__), '..'))
+    if output_dir:
+        os.makedirs(base_dir, exist_ok=True)
+    stats = ReportAccumulator(budgets, build_index=bool(shard_size), track_requests=incremental)
+    if shard_size:
+        test_data, tmp_dir, shard_count = _read_sharded(json_file, stats, base_dir, shard_size)
+    else:
+        # 讀取 JSON 數據
+        with open(json_file, 'r', encoding='utf-8') as f:
+            test_data = json.load(f)
+    _check_run(test_data)
+
+    name, date_str = _report_title(test_data)
+    report_title = f"{name} - {date_str}"
+    # 輸出檔名：name + startedAt(YYYY-MM-DD).html；分片目錄與其同名，副檔名為 .data
+    file_stem = f"{_sanitize_filename(name)} - {_sanitize_filename(date_str)}"
+    output_file = os.path.join(base_dir, file_stem + '.html')
+    if shard_size:
+        shard_dir = os.path.join(base_dir, file_stem + '.data')
+        _replace_shard_dir(tmp_dir, shard_dir)
+        test_data['_index'] = dict(stats.index(), shardDir=file_stem + '.data',
+                                   shardSize=shard_size, shardCount=shard_count)
+
+    appended = updated = state = None
+    if incremental:
+        state_file = os.path.join(base_dir, file_stem + '.state.json')
+        state_key = _state_key(test_data, budgets)
+        state = _load_state(state_file, output_file, state_key, len(test_data.get('results') or []))
+    if state:
+        stats = ReportAccumulator.from_state(state['accumulator'], budgets)
+        summary_offset, size, appended, updated = _append_to_report(
+            output_file, state['summaryOffset'], stats, test_data)
+    else:
+        if shard_size:
+            # 索引頁只含執行資訊與索引列，以精簡格式輸出
+            json_data = json.dumps(test_data, ensure_ascii=False, separators=(',', ':'))
+        else:
+            stats.set_collection(test_data.get('collection'))
+            results = test_data.get('results')
+            if jobs > 1 and isinstance(results, list) and len(results) >= 2 * PARALLEL_MIN_CHUNK:
+                json_data = _dump_parallel(test_data, stats, jobs)
+            else:
+                for r in (results or []):
+                    stats.add(r)
+                # 將 JSON 數據轉換為 JavaScript 格式並插入模板
+                json_data = json.dumps(test_data, ensure_ascii=False, indent=2)
+        slots = dict(_summary_slots(test_data, stats), title=report_title, json_data=json_data)
+        with open(output_file, 'wb') as f:
+            summary_offset = _write_html(f, slots)
+            size = f.tell()
+    if incremental:
+        _save_state(state_file, state_key, stats, summary_offset, size)
+
+    result = {
+        'output': output_file,
+        'results': stats.count,
+        'shards': shard_count if shard_size else 0,
+        'violations': stats.violations,
+        'appended': appended,
+        'updated': updated,
+    }
+    if not verbose:
+        return result
+
+    if state:
+        print(f"🔁 增量更新：新增 {appended} 筆結果，{updated} 筆結果有新的執行")
+    print(f"✅ HTML 報告已生成：{output_file}")
+    if shard_size:
+        print(f"🗂️ 資料分片：{shard_count} 個（每個 {shard_size} 筆），位於 {shard_dir}")
+    print(f"📊 包含 {stats.count} 個測試結果")
+    total_pass = test_data.get('totalPass') or 0
+    total_tests = total_pass + (test_data.get('totalFail') or 0)
+    pass_rate = f"{total_pass / total_tests * 100:.1f}%" if total_tests else '—'
+    print(f"🎯 測試通過率：{total_pass}/{total_tests} ({pass_rate})")
+    if budgets:
+        if stats.violations:
+            print(f"🚨 效能預算違規：{len(stats.violations)} 項（{stats.violating_requests} 個請求）")
+            print_budget_violations(stats.violations)
+        else:
+            print(f"✅ 效能預算：{len(budgets)} 條規則全數通過")
+    return result
+
+
+def _serve(stream_in, stream_out):
+    """常駐模式：每行讀入一個 JSON 指令並輸出一行 JSON 結果
+
+    指令欄位：json_file（必填）、budgets、shard_size、output_dir、incremental、jobs。
+    模板與模組已在行程中載入，每份報告只需付出讀檔與輸出的成本；
+    相同的預算設定檔在檔案未變更前只解析、編譯一次。
+    """
+    budget_cache = {}
+    for line in stream_in:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            cmd = json.loads(line)
+            if not isinstance(cmd, dict) or not cmd.get('json_file'):
+                raise ValueError('指令需為含 json_file 的 JSON 物件')
+            shard_size = cmd.get('shard_size')
+            if shard_size is not None and (not isinstance(shard_size, int) or shard_size < 1):
+                raise ValueError('shard_size 必須為正整數')
+            jobs = cmd.get('jobs', 1)
+            if not isinstance(jobs, int) or jobs < 0:
+                raise ValueError('jobs 必須為非負整數')
+            budgets = None
+            if cmd.get('budgets'):
+                key = (cmd['budgets'], os.path.getmtime(cmd['budgets']))
+                if key not in budget_cache:
+                    budget_cache[key] = load_budgets(cmd['budgets'])
+                budgets = budget_cache[key]
+            result = generate_html_report(cmd['json_file'], budgets, shard_size, cmd.get('output_dir'),
+                                          verbose=False, incremental=bool(cmd.get('incremental')), jobs=jobs)
+            reply = {'ok': True, 'output': result['output'], 'results': result['results'],
+                     'shards': result['shards'], 'violations': len(result['violations']),
+                     'appended': result['appended'], 'updated': result['updated']}
+        except Exception as e:
+            reply = {'ok': False, 'error': f'{type(e).__name__}: {e}'}
+        stream_out.write(json.dumps(reply, ensure_ascii=False) + '\n')
+        stream_out.flush()
+
+
+def _build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate Postman HTML report from a Postman test run JSON file')
+    parser.add_argument('json_file', nargs='?', help='Path to the Postman test run JSON file')
+    parser.add_argument('--budgets', help='Path to a performance budget JSON file; exits with code 1 when any budget is exceeded')
+    parser.add_argument('--shard-size', type=int, metavar='N',
+                        help='Write an index HTML plus data shard .js files holding N results each, loaded on demand')
+    parser.add_argument('--output-dir', help='Directory for the generated report (default: parent of this folder)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Keep a .state.json sidecar next to the report and, for a later export of the same run, '
+                             'process only new results and rewrite only the data and summary segments')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='Process and serialize results in N worker processes (0: one per CPU); '
+                             'the output is byte-identical to the default single-process run')
+    parser.add_argument('--serve', action='store_true',
+                        help='Read one JSON command per line from stdin and answer with one JSON line each, '
+                             'keeping the process warm for many reports')
+    return parser
+
+
+# 可直接解析的選項 → 值的型別；與 _build_parser() 的定義一致
+_VALUE_OPTIONS = {'--budgets': str, '--shard-size': int, '--output-dir': str, '--jobs': int}
+_FLAG_OPTIONS = ('--incremental', '--serve')
+
+
+def _parse_args_fast(argv):
+    """不建立 argparse 解析器，直接解析常見的參數形式
+
+    建立解析器需匯入 argparse 及其相依模組（shutil、gettext、locale），約佔冷啟動的數毫秒；
+    遇到 --help、--opt=value、縮寫、非正整數的數值等其他形式時回傳 None，改由 argparse 處理。
+    """
+    opts = {'json_file': None, 'budgets': None, 'shard_size': None, 'output_dir': None,
+            'incremental': False, 'jobs': 1, 'serve': False}
+    args = iter(argv)
+    for arg in args:
+        if arg in _FLAG_OPTIONS:
+            opts[arg[2:]] = True
+        elif arg in _VALUE_OPTIONS:
+            value = next(args, None)
+            if value is None or value.startswith('-'):
+                return None
+            if _VALUE_OPTIONS[arg] is int:
+                if not value.isdigit():
+                    return None
+                value = int(value)
+            opts[arg[2:].replace('-', '_')] = value
+        elif not arg.startswith('-') and opts['json_file'] is None:
+            opts['json_file'] = arg
+        else:
+            return None
+    return opts
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    args = _parse_args_fast(argv)
+    if args is None:
+        args = vars(_build_parser().parse_args(argv))
+
+    def error(message):
+        _build_parser().error(message)
+
+    if args['serve']:
+        _serve(sys.stdin, sys.stdout)
+        return 0
+    if not args['json_file']:
+        error('the following arguments are required: json_file')
+    if args['shard_size'] is not None and args['shard_size'] < 1:
+        error('--shard-size must be a positive integer')
+    if args['incremental'] and args['shard_size']:
+        error('--incremental cannot be combined with --shard-size')
+    if args['jobs'] < 0:
+        error('--jobs must be a non-negative integer')
+    budgets = None
+    if args['budgets']:
+        try:
+            budgets = load_budgets(args['budgets'])
+        except (OSError, ValueError) as e:
+            error(str(e))
+    # 結束代碼 1 只代表超出預算；讀檔、解析、寫檔失敗或其他非預期錯誤皆以 2 結束，
+    # CI 閘門不會誤判為預算違規
+    try:
+        result = generate_html_report(args['json_file'], budgets, args['shard_size'], args['output_dir'],
+                                      incremental=args['incremental'], jobs=args['jobs'])
+    except Exception as e:
+        print(f"❌ 報告生成失敗：{type(e).__name__}: {e}", file=sys.stderr)
+        return 2
+    return 1 if result['violations'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())